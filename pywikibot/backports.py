@@ -14,6 +14,30 @@ else:
     cache = _lru_cache(None)
 
 
+# functools.cached_property
+# Python 3.8 - 3.11 serialize the first access of each cached_property
+# with a lock shared by all instances; use the lock-free 3.12 variant.
+if PYTHON_VERSION >= (3, 12):
+    from functools import cached_property
+else:
+    class cached_property:  # noqa: N801
+
+        """Backport of functools.cached_property for Python < 3.12."""
+
+        def __init__(self, func):
+            """Initializer."""
+            self.func = func
+            self.attrname = func.__name__
+            self.__doc__ = func.__doc__
+
+        def __get__(self, instance, owner=None):
+            """Compute the value once and store it in the instance dict."""
+            if instance is None:
+                return self
+            value = instance.__dict__[self.attrname] = self.func(instance)
+            return value
+
+
 # typing
 if PYTHON_VERSION < (3, 5, 2):
     from typing import Dict as DefaultDict
@@ -3284,7 +3284,7 @@ class APISite(
                 % {'watch': watch})
         req = self._simple_request(**params)
 
-        self.lock_page(page)
+        locked_title = self.lock_page(page)
         try:
             while True:
                 try:
@@ -3382,7 +3382,7 @@ class APISite(
                 return False
 
         finally:
-            self.unlock_page(page)
+            self.unlock_page(page, locked_title)
 
     OnErrorExc = namedtuple('OnErrorExc', 'exception on_new_page')
 
@@ -3464,8 +3464,8 @@ class APISite(
         if timestamp:
             req['timestamp'] = timestamp
 
-        self.lock_page(source)
-        self.lock_page(dest)
+        source_title = self.lock_page(source)
+        dest_title = self.lock_page(dest)
         try:
             result = req.submit()
             pywikibot.debug('mergehistory response: {result}'
@@ -3483,8 +3483,8 @@ class APISite(
                 )
                 raise
         finally:
-            self.unlock_page(source)
-            self.unlock_page(dest)
+            self.unlock_page(source, source_title)
+            self.unlock_page(dest, dest_title)
 
         if 'mergehistory' not in result:
             pywikibot.error('mergehistory: {error}'.format(error=result))
@@ -3550,7 +3550,7 @@ class APISite(
                          'Cannot move page %(page)s because it '
                          'does not exist on %(site)s.')
         token = self.tokens['move']
-        self.lock_page(page)
+        locked_title = self.lock_page(page)
         req = self._simple_request(action='move',
                                    noredirect=noredirect,
                                    reason=summary,
@@ -3602,7 +3602,7 @@ class APISite(
                             _logger)
             raise
         finally:
-            self.unlock_page(page)
+            self.unlock_page(page, locked_title)
         if 'move' not in result:
             pywikibot.error('movepage: %s' % result)
             raise Error('movepage: unexpected response')
@@ -3658,7 +3658,7 @@ class APISite(
                                         title=page,
                                         token=self.tokens['rollback'],
                                         user=user)
-        self.lock_page(page)
+        locked_title = self.lock_page(page)
         req = self._simple_request(**parameters)
         try:
             req.submit()
@@ -3675,7 +3675,7 @@ class APISite(
                             _logger)
             raise
         finally:
-            self.unlock_page(page)
+            self.unlock_page(page, locked_title)
 
     # catalog of delete errors for use in error messages
     _dl_errors = {
@@ -3716,7 +3716,7 @@ class APISite(
             msg = pageid
 
         req = self._simple_request(**params)
-        self.lock_page(page)
+        locked_title = self.lock_page(page)
         try:
             req.submit()
         except api.APIError as err:
@@ -3734,7 +3734,7 @@ class APISite(
         else:
             page.clear_cache()
         finally:
-            self.unlock_page(page)
+            self.unlock_page(page, locked_title)
 
     @need_right('delete')
     def deleteoldimage(self, page, oldimage, reason: str):
@@ -3764,7 +3764,7 @@ class APISite(
             msg = pageid
 
         req = self._simple_request(**params)
-        self.lock_page(page)
+        locked_title = self.lock_page(page)
         try:
             req.submit()
         except api.APIError as err:
@@ -3782,7 +3782,7 @@ class APISite(
         else:
             page.clear_cache()
         finally:
-            self.unlock_page(page)
+            self.unlock_page(page, locked_title)
 
     @need_right('undelete')
     @deprecate_arg('summary', 'reason')
@@ -3800,7 +3800,7 @@ class APISite(
 
         """
         token = self.tokens['delete']
-        self.lock_page(page)
+        locked_title = self.lock_page(page)
 
         req = self._simple_request(action='undelete',
                                    title=page,
@@ -3822,7 +3822,7 @@ class APISite(
                             _logger)
             raise
         finally:
-            self.unlock_page(page)
+            self.unlock_page(page, locked_title)
 
     @need_right('undelete')
     def undelete_file_versions(self, page, reason: str, fileids=None):
@@ -3837,7 +3837,7 @@ class APISite(
         @type fileids: list
         """
         token = self.tokens['delete']
-        self.lock_page(page)
+        locked_title = self.lock_page(page)
 
         req = self._simple_request(action='undelete',
                                    title=page,
@@ -3859,7 +3859,7 @@ class APISite(
                             _logger)
             raise
         finally:
-            self.unlock_page(page)
+            self.unlock_page(page, locked_title)
 
     _protect_errors = {
         'noapiwrite': 'API editing not enabled on %(site)s wiki',
@@ -3914,7 +3914,7 @@ class APISite(
             (including ISO 8601).
         """
         token = self.tokens['protect']
-        self.lock_page(page)
+        locked_title = self.lock_page(page)
 
         protections = [ptype + '=' + level
                        for ptype, level in protections.items()
@@ -3947,7 +3947,7 @@ class APISite(
                     protection[ptype] = (level, expiry)
             page._protection = protection
         finally:
-            self.unlock_page(page)
+            self.unlock_page(page, locked_title)
 
     # TODO: implement undelete
 
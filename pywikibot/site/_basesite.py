@@ -6,12 +6,14 @@
 #
 import functools
 import re
+import sys
 import threading
 
 from warnings import warn
 
 import pywikibot
 
+from pywikibot.backports import cache, cached_property
 from pywikibot.exceptions import Error, FamilyMaintenanceWarning, UnknownSite
 from pywikibot.site._namespace import Namespace, NamespacesDict
 from pywikibot.throttle import Throttle
@@ -24,16 +26,48 @@ from pywikibot.tools import (
     SelfCallString,
 )
 
+# underscores and spaces, collapsed into a single space by sametitle
+_WS_RE = re.compile(r'[_ ]+')
+
+# default magic words of a BaseSite
+_REDIRECT_TAGS = ('REDIRECT', )
+_PAGENAME_TAGS = ('PAGENAME', )
+_PAGENAME2_TAGS = ('PAGENAMEE', )
+
+
+@cache
+def _code_characters() -> frozenset:
+    """Return the set of characters allowed in site codes."""
+    # built on first use; pywikibot.family may not be loaded at import time
+    return frozenset(pywikibot.family.CODE_CHARACTERS)
+
 
 class PageInUse(Error):
 
     """Page cannot be reserved for writing due to existing lock."""
 
 
+@cache
+def _compile_redirect_regex(pattern: str):
+    """Return a compiled redirect regex for the given keyword pattern."""
+    # A redirect starts with hash (#), followed by a keyword, then
+    # arbitrary stuff, then a wikilink. The wikilink may contain
+    # a label, although this is not useful.
+    return re.compile(r'\s*#{pattern}\s*:?\s*\[\[(.+?)(?:\|.*?)?\]\]'
+                      .format(pattern=pattern), re.IGNORECASE | re.DOTALL)
+
+
 class BaseSite(ComparableMixin):
 
     """Site methods that are independent of the communication interface."""
 
+    # lock_page and unlock_page state, created when a page is first locked
+    _init_lock = threading.Lock()
+    _pagemutex = None
+
+    # cache for disambcategory
+    _disambcat = None
+
     @remove_last_args(['sysop'])
     def __init__(self, code: str, fam=None, user=None) -> None:
         """
@@ -52,7 +86,7 @@ class BaseSite(ComparableMixin):
             pywikibot.log('BaseSite: code "{}" converted to lowercase'
                           .format(code))
             code = code.lower()
-        if not all(x in pywikibot.family.CODE_CHARACTERS for x in code):
+        if not _code_characters().issuperset(code):
             pywikibot.log('BaseSite: code "{}" contains invalid characters'
                           .format(code))
         self.__code = code
@@ -63,9 +97,11 @@ class BaseSite(ComparableMixin):
 
         self.obsolete = False
         # if we got an outdated language code, use the new one instead.
-        if self.__code in self.__family.obsolete:
-            if self.__family.obsolete[self.__code] is not None:
-                self.__code = self.__family.obsolete[self.__code]
+        # Family.obsolete builds a new mapping on each access.
+        obsolete = self.__family.obsolete
+        if self.__code in obsolete:
+            if obsolete[self.__code] is not None:
+                self.__code = obsolete[self.__code]
                 # Note the Site function in __init__ emits a UserWarning
                 # for this condition, showing the callers file and line no.
                 pywikibot.log('Site {} instantiated using aliases code of {}'
@@ -89,21 +125,21 @@ class BaseSite(ComparableMixin):
                 raise UnknownSite("Language '%s' does not exist in family %s"
                                   % (self.__code, self.__family.name))
 
+        # codes are compared and hashed frequently
+        self.__code = sys.intern(self.__code)
+        self._hash = None
         self._username = normalize_username(user)
 
         self.use_hard_category_redirects = (
             self.code in self.family.use_hard_category_redirects)
 
-        # following are for use with lock_page and unlock_page methods
-        self._pagemutex = threading.Condition()
-        self._locked_pages = set()
+        # cache for _interwiki_urls
+        self._iw_urls = {}
 
-    @property
+    @cached_property
     def throttle(self):
         """Return this Site's throttle. Initialize a new one if needed."""
-        if not hasattr(self, '_throttle'):
-            self._throttle = Throttle(self, multiplydelay=True)
-        return self._throttle
+        return Throttle(self, multiplydelay=True)
 
     @property
     def family(self):
@@ -128,37 +164,34 @@ class BaseSite(ComparableMixin):
         """
         return self.__code
 
-    @property
+    @cached_property
     def doc_subpage(self):
         """
         Return the documentation subpage for this Site.
 
         @rtype: tuple
         """
-        if not hasattr(self, '_doc_subpage'):
-            try:
-                doc, codes = self.family.doc_subpages.get('_default', ((), []))
-                if self.code not in codes:
-                    try:
-                        doc = self.family.doc_subpages[self.code]
-                    # Language not defined in doc_subpages in x_family.py file
-                    # It will use default for the family.
-                    # should it just raise an Exception and fail?
-                    # this will help to check the dictionary ...
-                    except KeyError:
-                        warn('Site {0} has no language defined in '
-                             'doc_subpages dict in {1}_family.py file'
-                             .format(self, self.family.name),
-                             FamilyMaintenanceWarning, 2)
-            # doc_subpages not defined in x_family.py file
-            except AttributeError:
-                doc = ()  # default
-                warn('Site {0} has no doc_subpages dict in {1}_family.py file'
-                     .format(self, self.family.name),
-                     FamilyMaintenanceWarning, 2)
-            self._doc_subpage = doc
-
-        return self._doc_subpage
+        try:
+            doc, codes = self.family.doc_subpages.get('_default', ((), []))
+            if self.code not in codes:
+                try:
+                    doc = self.family.doc_subpages[self.code]
+                # Language not defined in doc_subpages in x_family.py file
+                # It will use default for the family.
+                # should it just raise an Exception and fail?
+                # this will help to check the dictionary ...
+                except KeyError:
+                    warn('Site {0} has no language defined in '
+                         'doc_subpages dict in {1}_family.py file'
+                         .format(self, self.family.name),
+                         FamilyMaintenanceWarning, 3)
+        # doc_subpages not defined in x_family.py file
+        except AttributeError:
+            doc = ()  # default
+            warn('Site {0} has no doc_subpages dict in {1}_family.py file'
+                 .format(self, self.family.name),
+                 FamilyMaintenanceWarning, 3)
+        return doc
 
     def _cmpkey(self):
         """Perform equality and inequality tests on Site objects."""
@@ -167,9 +200,19 @@ class BaseSite(ComparableMixin):
     def __getstate__(self):
         """Remove Lock based classes before pickling."""
         new = self.__dict__.copy()
-        del new['_pagemutex']
-        if '_throttle' in new:
-            del new['_throttle']
+        new.pop('_pagemutex', None)
+        new.pop('_locked_pages', None)
+        new.pop('_disambcat', None)
+        new.pop('_iw_urls', None)
+        # cached properties are stored under their own name
+        new.pop('throttle', None)
+        new.pop('namespaces', None)
+        # string hashes are randomized per process
+        new['_hash'] = None
+        # Family methods delegated by __getattr__ are recreated on demand
+        for key, value in self.__dict__.items():
+            if isinstance(value, functools.partial):
+                del new[key]
         # site cache contains exception information, which can't be pickled
         if '_iw_sites' in new:
             del new['_iw_sites']
@@ -178,7 +221,7 @@ class BaseSite(ComparableMixin):
     def __setstate__(self, attrs):
         """Restore things removed in __getstate__."""
         self.__dict__.update(attrs)
-        self._pagemutex = threading.Condition()
+        self._iw_urls = {}
 
     def user(self):
         """Return the currently-logged in bot username, or None."""
@@ -193,7 +236,14 @@ class BaseSite(ComparableMixin):
         return self._username
 
     def __getattr__(self, attr):
-        """Delegate undefined methods calls to the Family object."""
+        """Delegate undefined methods calls to the Family object.
+
+        The delegated method is stored in the instance dict so that
+        further lookups do not pass this method again.
+        """
+        if attr.startswith('__') and attr.endswith('__'):
+            raise AttributeError("%s instance has no attribute '%s'"
+                                 % (self.__class__.__name__, attr))
         if hasattr(self.__class__, attr):
             return getattr(self.__class__, attr)
         try:
@@ -203,6 +253,7 @@ class BaseSite(ComparableMixin):
             f = functools.partial(method, self.code)
             if hasattr(method, '__doc__'):
                 f.__doc__ = method.__doc__
+            self.__dict__[attr] = f
             return f
         except AttributeError:
             raise AttributeError("%s instance has no attribute '%s'"
@@ -210,7 +261,7 @@ class BaseSite(ComparableMixin):
 
     def __str__(self):
         """Return string representing this Site's name and code."""
-        return self.family.name + ':' + self.code
+        return self.__family.name + ':' + self.__code
 
     @property
     def sitename(self):
@@ -219,29 +270,41 @@ class BaseSite(ComparableMixin):
 
     def __repr__(self):
         """Return internal representation."""
-        return '{0}("{1}", "{2}")'.format(
-            self.__class__.__name__, self.code, self.family)
+        return '%s("%s", "%s")' % (
+            self.__class__.__name__, self.__code, self.__family)
 
     def __hash__(self):
         """Return hashable key."""
-        return hash(repr(self))
+        if self._hash is None:
+            self._hash = hash(self._cmpkey())
+        return self._hash
+
+    @cached_property
+    def _languages(self):
+        """Tuple of all valid language codes for this site's Family."""
+        return tuple(self.family.langs)
 
     def languages(self):
-        """Return list of all valid language codes for this site's Family."""
-        return list(self.family.langs.keys())
+        """Return tuple of all valid language codes for this site's Family."""
+        return self._languages
 
     def validLanguageLinks(self):  # noqa: N802
         """Return list of language codes to be used in interwiki links."""
-        return [lang for lang in self.languages()
-                if self.namespaces.lookup_normalized_name(lang) is None]
+        names = self.namespaces.normalized_names
+        return [lang for lang in self.languages() if lang not in names]
 
     def _interwiki_urls(self, only_article_suffixes=False):
+        """Return the url paths of this site as a tuple."""
+        try:
+            return self._iw_urls[only_article_suffixes]
+        except KeyError:
+            pass
         base_path = self.path()
+        urls = (base_path + '/', base_path + '?title=', self.article_path)
         if not only_article_suffixes:
-            yield base_path
-        yield base_path + '/'
-        yield base_path + '?title='
-        yield self.article_path
+            urls = (base_path, ) + urls
+        self._iw_urls[only_article_suffixes] = urls
+        return urls
 
     @deprecated('APISite.namespaces.lookup_name', since='20150703',
                 future_warning=True)
@@ -266,12 +329,10 @@ class BaseSite(ComparableMixin):
         """Create default namespaces."""
         return Namespace.builtin_namespaces()
 
-    @property
+    @cached_property
     def namespaces(self):
         """Return dict of valid namespaces on this wiki."""
-        if not hasattr(self, '_namespaces'):
-            self._namespaces = NamespacesDict(self._build_namespaces())
-        return self._namespaces
+        return NamespacesDict(self._build_namespaces())
 
     def ns_normalize(self, value):
         """
@@ -286,18 +347,18 @@ class BaseSite(ComparableMixin):
 
     @remove_last_args(('default', ))
     def redirect(self):
-        """Return list of localized redirect tags for the site."""
-        return ['REDIRECT']
+        """Return tuple of localized redirect tags for the site."""
+        return _REDIRECT_TAGS
 
     @remove_last_args(('default', ))
     def pagenamecodes(self):
-        """Return list of localized PAGENAME tags for the site."""
-        return ['PAGENAME']
+        """Return tuple of localized PAGENAME tags for the site."""
+        return _PAGENAME_TAGS
 
     @remove_last_args(('default', ))
     def pagename2codes(self):
-        """Return list of localized PAGENAMEE tags for the site."""
-        return ['PAGENAMEE']
+        """Return tuple of localized PAGENAMEE tags for the site."""
+        return _PAGENAME2_TAGS
 
     def lock_page(self, page, block=True):
         """
@@ -310,30 +371,55 @@ class BaseSite(ComparableMixin):
         @type page: pywikibot.Page
         @param block: if true, wait until the page is available to be locked;
             otherwise, raise an exception if page can't be locked
+        @return: the locked title which may be passed to unlock_page
+        @rtype: str
 
         """
+        if self._pagemutex is None:
+            with BaseSite._init_lock:
+                if self._pagemutex is None:
+                    self._locked_pages = {}
+                    self._pagemutex = threading.Lock()
+
         title = page.title(with_section=False)
-        with self._pagemutex:
-            while title in self._locked_pages:
+        while True:
+            with self._pagemutex:
+                event = self._locked_pages.get(title)
+                if event is None:
+                    self._locked_pages[title] = threading.Event()
+                    return title
                 if not block:
                     raise PageInUse(title)
-                self._pagemutex.wait()
-            self._locked_pages.add(title)
+            # wait for this title only, not for any page being unlocked
+            event.wait()
 
-    def unlock_page(self, page):
+    def unlock_page(self, page, title=None):
         """
         Unlock page. Call as soon as a write operation has completed.
 
-        @param page: the page to be locked
+        Each call must be paired with a preceding lock_page call.
+
+        @param page: the page to be unlocked
         @type page: pywikibot.Page
+        @param title: the title returned by lock_page; it is determined
+            from page if not given
+        @type title: str
 
         """
+        if self._pagemutex is None:
+            return  # no page was locked yet
+        if title is None:
+            title = page.title(with_section=False)
         with self._pagemutex:
-            self._locked_pages.discard(page.title(with_section=False))
-            self._pagemutex.notify_all()
+            event = self._locked_pages.pop(title, None)
+        if event is not None:
+            event.set()
 
     def disambcategory(self):
         """Return Category in which disambig pages are listed."""
+        if self._disambcat is not None:
+            return self._disambcat
+
         if self.has_data_repository:
             repo = self.data_repository()
             repo_name = repo.family.name
@@ -355,14 +441,17 @@ class BaseSite(ComparableMixin):
 
         else:  # fallback for non WM sites
             try:
-                name = '{}:{}'.format(Namespace.CATEGORY,
-                                      self.family.disambcatname[self.code])
+                name = '{}:{}'.format(
+                    self.namespaces[Namespace.CATEGORY].custom_name,
+                    self.family.disambcatname[self.code])
             except KeyError:
                 raise Error(
                     'No disambiguation category name found in '
                     '{site.family.name}_family for {site}'.format(site=self))
 
-        return pywikibot.Category(pywikibot.Link(name, self))
+        # errors are not cached, a failing lookup may be retried
+        self._disambcat = pywikibot.Category(pywikibot.Link(name, self))
+        return self._disambcat
 
     def isInterwikiLink(self, text):  # noqa: N802
         """Return True if text is in the form of an interwiki link.
@@ -371,6 +460,9 @@ class BaseSite(ComparableMixin):
         belonging to a different site, this method returns True.
 
         """
+        # without a colon, even an encoded one, there is no site prefix
+        if ':' not in text and '%' not in text and '&' not in text:
+            return False
         linkfam, linkcode = pywikibot.Link(text, self).parse_site()
         return linkfam != self.family.name or linkcode != self.code
 
@@ -382,11 +474,7 @@ class BaseSite(ComparableMixin):
         """
         if pattern is None:
             pattern = 'REDIRECT'
-        # A redirect starts with hash (#), followed by a keyword, then
-        # arbitrary stuff, then a wikilink. The wikilink may contain
-        # a label, although this is not useful.
-        return re.compile(r'\s*#{pattern}\s*:?\s*\[\[(.+?)(?:\|.*?)?\]\]'
-                          .format(pattern=pattern), re.IGNORECASE | re.DOTALL)
+        return _compile_redirect_regex(pattern)
 
     def sametitle(self, title1: str, title2: str) -> bool:
         """
@@ -399,34 +487,44 @@ class BaseSite(ComparableMixin):
             """Separate the namespace from the name."""
             ns, delim, name = title.partition(':')
             if delim:
-                ns = self.namespaces.lookup_name(ns)
+                ns = namespaces.lookup_name(ns)
             if not delim or not ns:
                 return default_ns, title
             else:
                 return ns, name
 
         # Replace underscores with spaces and multiple combinations of them
-        # with only one space
-        title1 = re.sub(r'[_ ]+', ' ', title1)
-        title2 = re.sub(r'[_ ]+', ' ', title2)
+        # with only one space; most titles have neither so skip the sub
+        if '_' in title1 or '  ' in title1:
+            title1 = _WS_RE.sub(' ', title1)
+        if '_' in title2 or '  ' in title2:
+            title2 = _WS_RE.sub(' ', title2)
         if title1 == title2:
             return True
 
-        default_ns = self.namespaces[0]
+        namespaces = self.namespaces
+        default_ns = namespaces[0]
         # determine whether titles contain namespace prefixes
-        ns1_obj, name1 = ns_split(title1)
-        ns2_obj, name2 = ns_split(title2)
-        if ns1_obj != ns2_obj:
-            # pages in different namespaces
-            return False
+        if ':' in title1 or ':' in title2:
+            ns1_obj, name1 = ns_split(title1)
+            ns2_obj, name2 = ns_split(title2)
+            if ns1_obj != ns2_obj:
+                # pages in different namespaces
+                return False
+        else:
+            # both pages are in the default namespace
+            ns1_obj, name1, name2 = default_ns, title1, title2
 
         name1 = name1.strip()
         name2 = name2.strip()
         # If the namespace has a case definition it's overriding the site's
         # case definition
         if ns1_obj.case == 'first-letter':
-            name1 = first_upper(name1)
-            name2 = first_upper(name2)
+            # uppercase ASCII letters are already capitalized
+            if not 'A' <= name1[:1] <= 'Z':
+                name1 = first_upper(name1)
+            if not 'A' <= name2[:1] <= 'Z':
+                name2 = first_upper(name2)
         return name1 == name2
 
     # namespace shortcuts for backwards-compatibility
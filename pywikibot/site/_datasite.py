@@ -45,6 +45,7 @@ class DataSite(APISite):
         super().__init__(*args, **kwargs)
         self._item_namespace = None
         self._property_namespace = None
+        self._entity_namespaces = None
         self._type_to_class = {
             'item': pywikibot.ItemPage,
             'property': pywikibot.PropertyPage,
@@ -70,7 +71,7 @@ class DataSite(APISite):
         @return: corresponding namespace
         @rtype: Namespace
         """
-        if not hasattr(self, '_entity_namespaces'):
+        if self._entity_namespaces is None:
             self._cache_entity_namespaces()
         if entity_type in self._entity_namespaces:
             return self._entity_namespaces[entity_type]
@@ -229,7 +230,7 @@ class DataSite(APISite):
         @param groupsize: how many pages to query at a time
         @type groupsize: int
         """
-        if not hasattr(self, '_entity_namespaces'):
+        if self._entity_namespaces is None:
             self._cache_entity_namespaces()
         for sublist in itergroup(pagelist, groupsize):
             req = {'ids': [], 'titles': [], 'sites': []}
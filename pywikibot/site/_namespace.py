@@ -8,7 +8,7 @@ from collections.abc import Iterable, Mapping
 from enum import IntEnum
 from typing import Optional, Union
 
-from pywikibot.backports import List
+from pywikibot.backports import FrozenSet, List
 from pywikibot.tools import (
     ComparableMixin,
     deprecated_args,
@@ -329,6 +329,7 @@ class NamespacesDict(Mapping, SelfCallMixin):
         for namespace in self._namespaces.values():
             for name in namespace:
                 self._namespace_names[name.lower()] = namespace
+        self._normalized_names = frozenset(self._namespace_names)
 
     def __iter__(self):
         """Iterate over all namespaces."""
@@ -385,6 +386,11 @@ class NamespacesDict(Mapping, SelfCallMixin):
             return None
         return self.lookup_normalized_name(name.lower())
 
+    @property
+    def normalized_names(self) -> FrozenSet[str]:
+        """Lower case normalized names and aliases of all namespaces."""
+        return self._normalized_names
+
     def lookup_normalized_name(self, name: str) -> Optional[Namespace]:
         """
         Find the Namespace for a name also checking aliases.
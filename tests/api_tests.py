@@ -1004,7 +1004,7 @@ class TestLagpattern(DefaultSiteTestCase):
                 .format(mysite)
             )
         mythrottle = DummyThrottle(mysite)
-        mysite._throttle = mythrottle
+        mysite.throttle = mythrottle
         params = {'action': 'query',
                   'titles': self.get_mainpage().title(),
                   'maxlag': -1}
@@ -145,7 +145,7 @@ class TestDryCosmeticChanges(TestCosmeticChanges):
         # necessary as the fixer needs the article path to fix it
         self.cct.site._siteinfo._cache['general'] = (
             {'articlepath': '/wiki/$1'}, True)
-        self.cct.site._namespaces = {
+        self.cct.site.namespaces = {
             6: ['Datei', 'File'],
             14: ['Kategorie', 'Category'],
         }
@@ -232,7 +232,7 @@ class TestDryCosmeticChanges(TestCosmeticChanges):
                 '[[https://de.wikipedia.org/wiki/Datei:Example.svg '
                 'Description]]\n'
             ))
-        del self.cct.site._namespaces
+        del self.cct.site.namespaces
 
     def test_fixHtml(self):
         """Test fixHtml method."""
@@ -147,7 +147,7 @@ class MockCachedRequestKeyTests(TestCase):
 
             _loginstatus = LoginStatus.NOT_ATTEMPTED
 
-            _namespaces = {2: ['User']}
+            namespaces = {2: ['User']}
 
             def __init__(self):
                 self._user = 'anon'
@@ -217,7 +217,7 @@ class MockCachedRequestKeyTests(TestCase):
                             parameters={'action': 'query', 'meta': 'siteinfo'})
         en_user_path = req._cachefile_path()
 
-        self.mocksite._namespaces = {2: ['مستخدم']}
+        self.mocksite.namespaces = {2: ['مستخدم']}
 
         req = CachedRequest(expiry=1, site=self.mocksite,
                             parameters={'action': 'query', 'meta': 'siteinfo'})
@@ -4,13 +4,17 @@
 #
 # Distributed under the terms of the MIT license.
 #
+import pickle
+import threading
 import unittest
 
 import pywikibot
 
 from pywikibot.comms.http import user_agent
+from pywikibot.site import PageInUse
 
-from tests.aspects import DefaultDrySiteTestCase
+from tests import mock
+from tests.aspects import DefaultDrySiteTestCase, TestCase
 
 
 class TestDrySite(DefaultDrySiteTestCase):
@@ -54,6 +58,96 @@ class TestDrySite(DefaultDrySiteTestCase):
         with self.subTest(variant='sysop'):
             self.assertTrue(x.logged_in())
 
+    def test_lock_page(self):
+        """Test lock_page and unlock_page methods."""
+        x = self.get_site()
+        page = pywikibot.Page(x, 'Foo')
+
+        title = x.lock_page(page)
+        self.assertEqual(title, 'Foo')
+        with self.assertRaises(PageInUse):
+            x.lock_page(page, block=False)
+        x.unlock_page(page, title)
+        x.lock_page(page, block=False)
+        x.unlock_page(page)
+
+    def test_lock_page_threads(self):
+        """Test that unlocking a page only signals waiters for that page."""
+        x = self.get_site()
+        page = pywikibot.Page(x, 'Foo')
+        other = pywikibot.Page(x, 'Bar')
+        acquired = threading.Event()
+
+        def worker():
+            x.lock_page(page)
+            acquired.set()
+            x.unlock_page(page)
+
+        title = x.lock_page(page)
+        event = x._locked_pages[title]
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        self.assertFalse(acquired.wait(0.2), 'page lock was acquired twice')
+
+        x.lock_page(other, block=False)
+        x.unlock_page(other)
+        self.assertFalse(event.is_set(),
+                         'unlocking another page signalled the waiter')
+        self.assertFalse(acquired.is_set())
+        self.assertTrue(thread.is_alive())
+
+        x.unlock_page(page, title)
+        self.assertTrue(event.is_set())
+        self.assertTrue(acquired.wait(5), 'waiter did not acquire the page')
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_family_delegation(self):
+        """Test the cache of Family methods delegated by __getattr__."""
+        x = self.get_site()
+        x.__dict__.pop('path', None)
+
+        path = x.path
+        self.assertIs(x.__dict__['path'], path)
+        self.assertIs(x.path, path)
+        self.assertEqual(path(), x.family.path(x.code))
+
+        self.assertNotIn('path', x.__getstate__())
+        y = pickle.loads(pickle.dumps(x))
+        self.assertNotIn('path', y.__dict__)
+        self.assertEqual(y.path(), path())
+        self.assertIn('path', y.__dict__)
+
+        with self.assertRaises(AttributeError):
+            x.__foo__
+        self.assertNotIn('__foo__', x.__dict__)
+
+    def test_hash(self):
+        """Test the cached site hash."""
+        x = self.get_site()
+        self.assertEqual(hash(x), hash(x._cmpkey()))
+        self.assertEqual(hash(x), hash(x))
+        self.assertIsNone(x.__getstate__()['_hash'])
+        self.assertEqual(hash(pickle.loads(pickle.dumps(x))), hash(x))
+
+    def test_interwiki_urls(self):
+        """Test _interwiki_urls method."""
+        x = self.get_site()
+        x._iw_urls.clear()
+        self.addCleanup(x._iw_urls.clear)
+        general = {'articlepath': '/wiki/$1'}
+        with mock.patch.dict(x._siteinfo._cache, general=(general, True)):
+            path = x.path()
+            urls = x._interwiki_urls()
+            self.assertEqual(urls, (path, path + '/', path + '?title=',
+                                    '/wiki/'))
+            self.assertIs(x._interwiki_urls(), urls)
+
+            suffixes = x._interwiki_urls(True)
+            self.assertEqual(suffixes, urls[1:])
+            self.assertIs(x._interwiki_urls(True), suffixes)
+
     def test_user_agent(self):
         """Test different variants of user agents."""
         x = self.get_site()
@@ -107,5 +201,39 @@ class TestDrySite(DefaultDrySiteTestCase):
                                     format_string='Foo ({script_comments})'))
 
 
+class TestDisambcategory(TestCase):
+
+    """Test disambcategory on a site without data repository."""
+
+    family = 'wowwiki'
+    code = 'en'
+
+    dry = True
+
+    def setUp(self):
+        """Clear the cached disambiguation category."""
+        super().setUp()
+        self.get_site().__dict__.pop('_disambcat', None)
+
+    def test_disambcategory(self):
+        """Test that a Category is cached but an error is not."""
+        x = self.get_site()
+        self.assertFalse(x.has_data_repository)
+
+        with mock.patch.dict(x.family.disambcatname, clear=True):
+            with self.assertRaises(pywikibot.Error):
+                x.disambcategory()
+        self.assertIsNone(x._disambcat)
+
+        cat = x.disambcategory()
+        self.assertIsInstance(cat, pywikibot.Category)
+        self.assertEqual(cat.title(with_ns=False), 'Disambiguations')
+        self.assertIs(x.disambcategory(), cat)
+
+        # a cached Category is returned without another lookup
+        with mock.patch.dict(x.family.disambcatname, clear=True):
+            self.assertIs(x.disambcategory(), cat)
+
+
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
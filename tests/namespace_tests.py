@@ -314,6 +314,18 @@ class TestNamespacesDictLookupName(TestCase):
                         self.assertIsNone(
                             self.namespaces.lookup_normalized_name(name))
 
+    def test_normalized_names(self):
+        """Test normalized_names."""
+        names = self.namespaces.normalized_names
+        self.assertIsInstance(names, frozenset)
+        for ns_id, values in self.tests.items():
+            for name in values:
+                with self.subTest(name=name, ns_id=ns_id):
+                    self.assertEqual(
+                        name in names,
+                        self.namespaces.lookup_normalized_name(name)
+                        is not None)
+
 
 class TestNamespacesDictGetItem(TestCase):
 
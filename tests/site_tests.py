@@ -156,7 +156,7 @@ class TestSiteObject(DefaultSiteTestCase):
         """Test cases for languages() and related methods."""
         mysite = self.get_site()
         langs = mysite.languages()
-        self.assertIsInstance(langs, list)
+        self.assertIsInstance(langs, tuple)
         self.assertIn(mysite.code, langs)
         self.assertIsInstance(mysite.obsolete, bool)
         ipf = mysite.interwiki_putfirst()
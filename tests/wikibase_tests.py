@@ -1959,7 +1959,7 @@ class TestAlternateNamespaces(WikidataTestCase):
         """Setup test class."""
         super().setUpClass()
 
-        cls.get_repo()._namespaces = NamespacesDict({
+        cls.get_repo().namespaces = NamespacesDict({
             90: Namespace(id=90,
                           case='first-letter',
                           canonical_name='Item',